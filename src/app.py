@@ -5,7 +5,7 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 import os
@@ -81,24 +81,33 @@ activities = {
 }
 
 
+def get_activities_db():
+    """Provide the activity database used by the API routes"""
+    return activities
+
+
 @app.get("/")
 def root():
     return RedirectResponse(url="/static/index.html")
 
 
 @app.get("/activities")
-def get_activities():
+def get_activities(activities: dict = Depends(get_activities_db)):
     return activities
 
 
 @app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
+def signup_for_activity(activity_name: str, email: str,
+                        activities: dict = Depends(get_activities_db)):
     """Sign up a student for an activity"""
     # Validate activity exists
     
     
     if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+        raise HTTPException(status_code=404, detail={
+            "message": "Activity not found",
+            "code": "ACTIVITY_NOT_FOUND"
+        })
 
     # Get the specific activity
     activity = activities[activity_name]
@@ -106,23 +115,33 @@ def signup_for_activity(activity_name: str, email: str):
     # Add student 
     # Validate student is not already signed up
     if email in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student already signed up for this activity")
+        raise HTTPException(status_code=400, detail={
+            "message": "Student already signed up for this activity",
+            "code": "ALREADY_SIGNED_UP"
+        })
     activity["participants"].append(email)
     return {"message": f"Signed up {email} for {activity_name}"}
 
 
 @app.delete("/activities/{activity_name}/unregister")
-def unregister_from_activity(activity_name: str, email: str):
+def unregister_from_activity(activity_name: str, email: str,
+                             activities: dict = Depends(get_activities_db)):
     """Unregister a student from an activity"""
     # Validate activity exists
     if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+        raise HTTPException(status_code=404, detail={
+            "message": "Activity not found",
+            "code": "ACTIVITY_NOT_FOUND"
+        })
 
     # Get the specific activity
     activity = activities[activity_name]
 
     # Remove student
     if email not in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student is not registered for this activity")
+        raise HTTPException(status_code=400, detail={
+            "message": "Student is not registered for this activity",
+            "code": "NOT_REGISTERED"
+        })
     activity["participants"].remove(email)
     return {"message": f"Unregistered {email} from {activity_name}"}
@@ -78,7 +78,7 @@ document.addEventListener("DOMContentLoaded", () => {
               // Refresh activities list
               await fetchActivities();
             } else {
-              messageDiv.textContent = result.detail || "An error occurred";
+              messageDiv.textContent = result.detail?.message || "An error occurred";
               messageDiv.className = "error";
             }
 
@@ -126,7 +126,7 @@ document.addEventListener("DOMContentLoaded", () => {
         // Refresh activities list
         await fetchActivities();
       } else {
-        messageDiv.textContent = result.detail || "An error occurred";
+        messageDiv.textContent = result.detail?.message || "An error occurred";
         messageDiv.className = "error";
       }
 
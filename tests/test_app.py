@@ -8,265 +8,229 @@ Tests cover:
 - Error handling and validation
 """
 
+import orjson
+import pickle
 import pytest
-from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
+from urllib.parse import quote
 
-# Add src directory to path so we can import app
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from app import app, activities
+# URL-encoded endpoint paths, built once at import for every activity name
+# the tests use (including names that must not exist)
+_PATH_NAMES = ("Chess Club", "Programming Class", "Nonexistent Club", "chess club")
+SIGNUP_PATHS = {name: f"/activities/{quote(name)}/signup" for name in _PATH_NAMES}
+UNREGISTER_PATHS = {name: f"/activities/{quote(name)}/unregister" for name in _PATH_NAMES}
 
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+def _json(response):
+    """Decode a response body with orjson instead of the stdlib json module"""
+    return orjson.loads(response.content)
+
+
+def _participants_set(data, activity):
+    """Participants of an activity as a set, for repeated membership checks"""
+    return set(data[activity]["participants"])
+
+
+@pytest.fixture(scope="session")
+async def client():
+    """Create a single async client for the FastAPI app, shared by all tests"""
+    # Imported here so collection-only and filtered runs skip the app import
+    import httpx
+    from app import app
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                 base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def _pristine_bytes():
+    """Pickled snapshot of the initial activities, taken once per session"""
+    from app import activities
+    
+    return pickle.dumps(activities)
 
 
 @pytest.fixture
-def reset_activities():
-    """Reset activities to initial state before each test"""
-    # Store original state
-    original_activities = {
-        name: {
-            "description": details["description"],
-            "schedule": details["schedule"],
-            "max_participants": details["max_participants"],
-            "participants": details["participants"].copy()
-        }
-        for name, details in activities.items()
-    }
+def activities_db(_pristine_bytes):
+    """Give each test its own copy of the activities via a dependency override"""
+    from app import app, get_activities_db
+    
+    # Unpickling plain data is several times faster than copy.deepcopy
+    db = pickle.loads(_pristine_bytes)
+    app.dependency_overrides[get_activities_db] = lambda: db
     
-    yield
+    yield db
     
-    # Restore original state after test
-    for name, details in original_activities.items():
-        activities[name] = details
+    app.dependency_overrides.pop(get_activities_db, None)
+
+
+@pytest.fixture(scope="module")
+async def activities_snapshot(client):
+    """Parsed GET /activities payload, fetched once for the read-only tests"""
+    response = await client.get("/activities")
+    response.raise_for_status()
+    return _json(response)
 
 
 class TestGetActivities:
     """Test cases for GET /activities endpoint"""
     
-    def test_get_activities_returns_dict(self, client, reset_activities):
-        """Test that /activities returns a dictionary of activities"""
-        response = client.get("/activities")
-        
-        assert response.status_code == 200
-        data = response.json()
+    def test_get_activities(self, activities_snapshot):
+        """Test that /activities returns every activity with well-formed fields"""
+        data = activities_snapshot
         assert isinstance(data, dict)
-    
-    def test_get_activities_contains_expected_fields(self, client, reset_activities):
-        """Test that each activity has required fields"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        for activity_name, activity_info in data.items():
-            assert "description" in activity_info
-            assert "schedule" in activity_info
-            assert "max_participants" in activity_info
-            assert "participants" in activity_info
-            assert isinstance(activity_info["participants"], list)
-    
-    def test_get_activities_contains_known_activity(self, client, reset_activities):
-        """Test that known activities are returned"""
-        response = client.get("/activities")
-        data = response.json()
         
+        # Known activities and their participants are returned
         assert "Chess Club" in data
         assert "Programming Class" in data
         assert "Drama Club" in data
-    
-    def test_get_activities_participants_are_emails(self, client, reset_activities):
-        """Test that participants are email addresses"""
-        response = client.get("/activities")
-        data = response.json()
+        assert {"michael@mergington.edu", "daniel@mergington.edu"} <= _participants_set(data, "Chess Club")
         
         for activity_info in data.values():
-            for participant in activity_info["participants"]:
-                assert "@" in participant
+            # Each activity has the required fields
+            assert "description" in activity_info
+            assert "schedule" in activity_info
+            assert "max_participants" in activity_info
+            assert "participants" in activity_info
+            assert isinstance(activity_info["participants"], list)
+            
+            # Participants are email addresses
+            assert all("@" in participant for participant in activity_info["participants"])
 
 
 class TestSignupForActivity:
     """Test cases for POST /activities/{activity_name}/signup endpoint"""
     
-    def test_signup_success(self, client, reset_activities):
-        """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Chess%20Club/signup",
-            params={"email": "newstudent@mergington.edu"}
+    @pytest.mark.parametrize(
+        "activity, email, status, body",
+        [
+            pytest.param("Chess Club", "newstudent@mergington.edu", 200,
+                         {"message": "Signed up newstudent@mergington.edu for Chess Club"},
+                         id="success"),
+            pytest.param("Programming Class", "programmer@mergington.edu", 200,
+                         {"message": "Signed up programmer@mergington.edu for Programming Class"},
+                         id="name-with-spaces"),
+            pytest.param("Chess Club", "michael@mergington.edu", 400,
+                         {"detail": {"message": "Student already signed up for this activity",
+                                     "code": "ALREADY_SIGNED_UP"}},
+                         id="duplicate"),
+        ],
+    )
+    async def test_signup_matrix(self, client, activities_db, activity, email, status, body):
+        """Test signup responses across success and error cases"""
+        response = await client.post(
+            SIGNUP_PATHS[activity],
+            params={"email": email}
         )
         
-        assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-        assert "newstudent@mergington.edu" in data["message"]
-        assert "Chess Club" in data["message"]
+        assert response.status_code == status
+        assert _json(response) == body
     
-    def test_signup_adds_participant(self, client, reset_activities):
+    async def test_signup_adds_participant(self, client, activities_db):
         """Test that signup actually adds the participant"""
         new_email = "test@mergington.edu"
         
         # Get initial participant count
-        response_before = client.get("/activities")
-        participants_before = response_before.json()["Chess Club"]["participants"].copy()
+        count_before = len(activities_db["Chess Club"]["participants"])
         
         # Sign up
-        client.post(
-            "/activities/Chess%20Club/signup",
+        await client.post(
+            SIGNUP_PATHS["Chess Club"],
             params={"email": new_email}
         )
         
         # Check participant was added
-        response_after = client.get("/activities")
-        participants_after = response_after.json()["Chess Club"]["participants"]
+        participants_after = activities_db["Chess Club"]["participants"]
         
         assert new_email in participants_after
-        assert len(participants_after) == len(participants_before) + 1
+        assert len(participants_after) == count_before + 1
     
-    def test_signup_duplicate_fails(self, client, reset_activities):
-        """Test that signing up twice for same activity fails"""
-        email = "michael@mergington.edu"  # Already in Chess Club
-        
-        response = client.post(
-            "/activities/Chess%20Club/signup",
-            params={"email": email}
-        )
-        
-        assert response.status_code == 400
-        data = response.json()
-        assert "already signed up" in data["detail"].lower()
-    
-    def test_signup_nonexistent_activity_fails(self, client, reset_activities):
-        """Test that signing up for non-existent activity fails"""
-        response = client.post(
-            "/activities/Nonexistent%20Club/signup",
-            params={"email": "student@mergington.edu"}
-        )
-        
-        assert response.status_code == 404
-        data = response.json()
-        assert "not found" in data["detail"].lower()
-    
-    def test_signup_multiple_activities(self, client, reset_activities):
+    def test_signup_multiple_activities(self, activities_db):
         """Test that a student can sign up for multiple activities"""
-        email = "versatile@mergington.edu"
+        # Pure signup logic, so call the handler directly instead of over HTTP
+        from app import signup_for_activity
         
-        # Sign up for Chess Club
-        response1 = client.post(
-            "/activities/Chess%20Club/signup",
-            params={"email": email}
-        )
-        assert response1.status_code == 200
+        email = "versatile@mergington.edu"
         
-        # Sign up for Programming Class
-        response2 = client.post(
-            "/activities/Programming%20Class/signup",
-            params={"email": email}
-        )
-        assert response2.status_code == 200
+        # Sign up for Chess Club and Programming Class
+        signup_for_activity("Chess Club", email, activities=activities_db)
+        signup_for_activity("Programming Class", email, activities=activities_db)
         
         # Verify both signups
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Chess Club"]["participants"]
-        assert email in data["Programming Class"]["participants"]
+        assert email in activities_db["Chess Club"]["participants"]
+        assert email in activities_db["Programming Class"]["participants"]
 
 
 class TestUnregisterFromActivity:
     """Test cases for DELETE /activities/{activity_name}/unregister endpoint"""
     
-    def test_unregister_success(self, client, reset_activities):
-        """Test successful unregistration from an activity"""
-        email = "michael@mergington.edu"  # Already in Chess Club
-        
-        response = client.delete(
-            "/activities/Chess%20Club/unregister",
+    @pytest.mark.parametrize(
+        "activity, email, status, body",
+        [
+            pytest.param("Chess Club", "michael@mergington.edu", 200,
+                         {"message": "Unregistered michael@mergington.edu from Chess Club"},
+                         id="success"),
+            pytest.param("Chess Club", "notregistered@mergington.edu", 400,
+                         {"detail": {"message": "Student is not registered for this activity",
+                                     "code": "NOT_REGISTERED"}},
+                         id="not-registered"),
+        ],
+    )
+    async def test_unregister_matrix(self, client, activities_db, activity, email, status, body):
+        """Test unregister responses across success and error cases"""
+        response = await client.delete(
+            UNREGISTER_PATHS[activity],
             params={"email": email}
         )
         
-        assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-        assert email in data["message"]
-        assert "Unregistered" in data["message"]
+        assert response.status_code == status
+        assert _json(response) == body
     
-    def test_unregister_removes_participant(self, client, reset_activities):
+    async def test_unregister_removes_participant(self, client, activities_db):
         """Test that unregister actually removes the participant"""
         email = "michael@mergington.edu"
         
         # Verify participant is there initially
-        response_before = client.get("/activities")
-        assert email in response_before.json()["Chess Club"]["participants"]
+        assert email in activities_db["Chess Club"]["participants"]
         
         # Unregister
-        client.delete(
-            "/activities/Chess%20Club/unregister",
+        await client.delete(
+            UNREGISTER_PATHS["Chess Club"],
             params={"email": email}
         )
         
         # Verify participant was removed
-        response_after = client.get("/activities")
-        assert email not in response_after.json()["Chess Club"]["participants"]
-    
-    def test_unregister_not_registered_fails(self, client, reset_activities):
-        """Test that unregistering a non-registered user fails"""
-        response = client.delete(
-            "/activities/Chess%20Club/unregister",
-            params={"email": "notregistered@mergington.edu"}
-        )
-        
-        assert response.status_code == 400
-        data = response.json()
-        assert "not registered" in data["detail"].lower()
+        assert email not in activities_db["Chess Club"]["participants"]
     
-    def test_unregister_nonexistent_activity_fails(self, client, reset_activities):
-        """Test that unregistering from non-existent activity fails"""
-        response = client.delete(
-            "/activities/Nonexistent%20Club/unregister",
-            params={"email": "student@mergington.edu"}
-        )
-        
-        assert response.status_code == 404
-        data = response.json()
-        assert "not found" in data["detail"].lower()
-    
-    def test_unregister_then_reregister(self, client, reset_activities):
+    def test_unregister_then_reregister(self, activities_db):
         """Test that a student can unregister and re-register"""
+        # Pure signup logic, so call the handlers directly instead of over HTTP
+        from app import signup_for_activity, unregister_from_activity
+        
         email = "temp@mergington.edu"
         
         # Sign up
-        client.post(
-            "/activities/Chess%20Club/signup",
-            params={"email": email}
-        )
+        signup_for_activity("Chess Club", email, activities=activities_db)
         
         # Unregister
-        response1 = client.delete(
-            "/activities/Chess%20Club/unregister",
-            params={"email": email}
-        )
-        assert response1.status_code == 200
+        result = unregister_from_activity("Chess Club", email, activities=activities_db)
+        assert result == {"message": f"Unregistered {email} from Chess Club"}
         
         # Re-register
-        response2 = client.post(
-            "/activities/Chess%20Club/signup",
-            params={"email": email}
-        )
-        assert response2.status_code == 200
+        result = signup_for_activity("Chess Club", email, activities=activities_db)
+        assert result == {"message": f"Signed up {email} for Chess Club"}
         
         # Verify registered again
-        response = client.get("/activities")
-        assert email in response.json()["Chess Club"]["participants"]
+        assert email in activities_db["Chess Club"]["participants"]
 
 
 class TestRoot:
     """Test cases for root endpoint"""
     
-    def test_root_redirects_to_static(self, client, reset_activities):
+    async def test_root_redirects_to_static(self, client):
         """Test that root endpoint redirects to static HTML"""
-        response = client.get("/", follow_redirects=False)
+        response = await client.get("/", follow_redirects=False)
         
         assert response.status_code == 307
         assert "/static/index.html" in response.headers["location"]
@@ -275,44 +239,51 @@ class TestRoot:
 class TestEdgeCases:
     """Test cases for edge cases and special scenarios"""
     
-    def test_email_with_special_characters(self, client, reset_activities):
+    async def test_email_with_special_characters(self, client, activities_db):
         """Test handling of emails with special characters"""
         email = "student+tag@mergington.edu"
         
-        response = client.post(
-            "/activities/Chess%20Club/signup",
+        response = await client.post(
+            SIGNUP_PATHS["Chess Club"],
             params={"email": email}
         )
         
         assert response.status_code == 200
-        response = client.get("/activities")
-        assert email in response.json()["Chess Club"]["participants"]
+        assert email in activities_db["Chess Club"]["participants"]
     
-    def test_activity_name_with_spaces(self, client, reset_activities):
-        """Test handling of activity names with spaces"""
-        # "Programming Class" has spaces
-        response = client.post(
-            "/activities/Programming%20Class/signup",
-            params={"email": "programmer@mergington.edu"}
+    @pytest.mark.parametrize(
+        "method, paths",
+        [
+            pytest.param("POST", SIGNUP_PATHS, id="signup"),
+            pytest.param("DELETE", UNREGISTER_PATHS, id="unregister"),
+        ],
+    )
+    async def test_nonexistent_activity_404(self, client, activities_db, method, paths):
+        """Test that both endpoints reject a non-existent activity"""
+        response = await client.request(
+            method,
+            paths["Nonexistent Club"],
+            params={"email": "student@mergington.edu"}
         )
         
-        assert response.status_code == 200
+        assert response.status_code == 404
+        assert _json(response) == {
+            "detail": {"message": "Activity not found", "code": "ACTIVITY_NOT_FOUND"}
+        }
     
-    def test_case_sensitive_activity_names(self, client, reset_activities):
+    async def test_case_sensitive_activity_names(self, client, activities_db):
         """Test that activity names are case-sensitive"""
-        response = client.post(
-            "/activities/chess%20club/signup",  # lowercase
+        response = await client.post(
+            SIGNUP_PATHS["chess club"],  # lowercase
             params={"email": "student@mergington.edu"}
         )
         
         # Should fail because "chess club" doesn't exist (only "Chess Club")
         assert response.status_code == 404
     
-    def test_activity_max_participants_tracking(self, client, reset_activities):
+    def test_activity_max_participants_tracking(self, activities_snapshot):
         """Test that activity max_participants is preserved"""
-        response = client.get("/activities")
-        
-        for activity_info in response.json().values():
+        for activity_info in activities_snapshot.values():
             assert isinstance(activity_info["max_participants"], int)
             assert activity_info["max_participants"] > 0
             assert len(activity_info["participants"]) <= activity_info["max_participants"]